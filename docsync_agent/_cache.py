@@ -0,0 +1,85 @@
+"""On-disk cache of scan results for the DocSync Agent.
+
+Parsing dominates CPU time when scanning a large project, yet most
+files are unchanged between CLI runs. This module stores pickled scan
+results in a ``.docsync_cache/`` directory under the scanned project's
+root, keyed by the SHA-256 of the source bytes plus the interpreter
+version, so unchanged files cost only a hash and an unpickle on
+subsequent runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sys
+import time
+from typing import Any, Optional
+
+CACHE_DIR_NAME = ".docsync_cache"
+
+# Pickled payloads are tied to the interpreter that produced them, so the
+# version is folded into every key. The format number is bumped whenever
+# the pickled row layout changes (e.g. new FunctionInfo slots), retiring
+# entries that would otherwise unpickle with missing attributes.
+_VERSION_TAG = f"py{sys.version_info.major}.{sys.version_info.minor}"
+_FORMAT_VERSION = 2
+
+# Entries untouched for this long are dropped by prune(). Loads refresh
+# an entry's mtime, so only files deleted or unchanged-and-unscanned for
+# a month ever age out.
+_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+
+def cache_key(source: bytes) -> str:
+    """Return the cache key for the given source bytes."""
+    return f"{hashlib.sha256(source).hexdigest()}.{_VERSION_TAG}.v{_FORMAT_VERSION}"
+
+
+def load(root: str, key: str) -> Optional[Any]:
+    """Return the cached value for ``key`` under ``root``, or ``None``."""
+    path = os.path.join(root, CACHE_DIR_NAME, key)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    try:
+        # Mark the entry as live so prune() keeps it around
+        os.utime(path)
+    except OSError:
+        pass
+    return value
+
+
+def store(root: str, key: str, value: Any) -> None:
+    """Persist ``value`` under ``key`` in ``root``'s cache. Filesystem errors are ignored."""
+    cache_dir = os.path.join(root, CACHE_DIR_NAME)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, key), "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+
+def prune(root: str, max_age_seconds: float = _MAX_AGE_SECONDS) -> None:
+    """Delete cache entries under ``root`` not touched within ``max_age_seconds``.
+
+    Keys are content hashes, so every edit to a source file strands its
+    old entry; without eviction the cache grows with each change ever
+    made. Best effort: a cache that cannot be pruned is left alone.
+    """
+    cutoff = time.time() - max_age_seconds
+    try:
+        entries = os.scandir(os.path.join(root, CACHE_DIR_NAME))
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except OSError:
+                continue
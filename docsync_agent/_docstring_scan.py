@@ -0,0 +1,42 @@
+"""Fast docstring-presence detection for insert-only runs.
+
+When the CLI only inserts docstrings (``--no-readme``), all it needs
+per function is the name and location of each undocumented ``def`` —
+not the full signature or the docstring text. A compiled extension
+(:mod:`docsync_agent._docstring_scan_c`, a small byte-scanner that
+finds ``def``/``async def``, skips to the matching ``:`` and checks
+for a leading quote) answers that far faster than a full parse; when
+it is absent, the answer is derived from the regular scanners. Both
+implementations return ``(lineno, col_offset, name, body_lineno)``
+tuples, one per undocumented function.
+"""
+
+from __future__ import annotations
+
+import ast
+from typing import List, Tuple
+
+try:
+    from ._docstring_scan_c import missing_docstring_defs  # type: ignore[attr-defined]
+except ImportError:
+
+    def missing_docstring_defs(source: bytes) -> List[Tuple[int, int, str, int | None]]:
+        """Return ``(lineno, col_offset, name, body_lineno)`` per undocumented function."""
+        # Imported lazily to avoid a cycle: scanner imports this module
+        from . import scanner
+
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            # Mirror scan_python_file: try to salvage what the full
+            # parser rejected
+            functions = scanner._scan_via_tokens(source, "<memory>")
+            if functions is None:
+                return []
+        else:
+            functions = scanner._gather_functions(tree, "<memory>")
+        return [
+            (func.lineno, func.col_offset, func.name, func.body_lineno)
+            for func in functions
+            if func.docstring is None
+        ]
@@ -14,10 +14,27 @@ Example usage:
 from __future__ import annotations
 
 import argparse
+import functools
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from .scanner import find_python_files, scan_python_file, insert_missing_docstrings, update_readme
+from . import _cache, scanner
+from .scanner import (
+    FunctionTable,
+    find_python_files_parallel,
+    insert_missing_docstrings,
+    iter_python_files,
+    scan_missing_docstrings,
+    scan_project,
+    scan_python_file,
+    update_readme,
+)
+
+
+# Below this many files, a process pool costs more to start than the
+# parallel parse saves.
+_PARALLEL_SCAN_MIN_FILES = 50
 
 
 def parse_args() -> argparse.Namespace:
@@ -39,6 +56,24 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Do not update the README. Only insert missing docstrings.",
     )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Directory name to skip during traversal (repeatable). Extends the built-in prune list (.git, .venv, __pycache__, ...).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk scan cache (.docsync_cache/).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of threads used to walk the project directory. Values above 1 help on slow (e.g. network) filesystems.",
+    )
     return parser.parse_args()
 
 
@@ -47,24 +82,52 @@ def main() -> None:
     project_dir = Path(args.project_dir).expanduser().resolve()
     if not project_dir.is_dir():
         raise SystemExit(f"Error: {project_dir} is not a valid directory")
-    # Find Python files in the project
-    files = find_python_files(str(project_dir))
-    functions = []
-    for file_path in files:
-        functions.extend(scan_python_file(file_path))
-    # Insert docstrings if requested
+    use_cache = not args.no_cache
+    if use_cache:
+        # Drop entries stranded by source edits before this run adds more
+        _cache.prune(str(project_dir))
+    table = FunctionTable()
+    if scanner._scanner_rs is not None:
+        # The native extension walks and parses the whole project in one
+        # call, so the Python-side traversal and pools are unnecessary.
+        table.extend(scan_project(str(project_dir), use_cache=use_cache, exclude=args.exclude))
+    else:
+        if args.workers > 1:
+            file_iter = find_python_files_parallel(
+                str(project_dir), workers=args.workers, exclude=args.exclude
+            )
+        else:
+            file_iter = iter_python_files(str(project_dir), exclude=args.exclude)
+        files = list(file_iter)
+        # Insert-only runs need just the undocumented defs, which the
+        # lighter scanner answers without building full rows
+        insert_only = args.no_readme and not args.no_docstrings
+        if insert_only:
+            scan = scan_missing_docstrings
+        else:
+            scan = functools.partial(
+                scan_python_file, use_cache=use_cache, cache_root=str(project_dir)
+            )
+        if len(files) >= _PARALLEL_SCAN_MIN_FILES:
+            # Parsing is CPU-bound and per-file independent, so fan the
+            # scan out across cores. Results arrive in submission order,
+            # keeping the table deterministic.
+            with ProcessPoolExecutor() as executor:
+                for result in executor.map(scan, files, chunksize=32):
+                    table.extend(result)
+        else:
+            # Pool startup costs more than it saves on small projects
+            for file_path in files:
+                table.extend(scan(file_path))
+    # Insert docstrings if requested; the stubbed rows are patched in the
+    # table by insert_missing_docstrings, so no re-scan is needed before
+    # README generation.
     if not args.no_docstrings:
-        inserted = insert_missing_docstrings(functions)
+        inserted, _mutated = insert_missing_docstrings(table)
         print(f"Inserted {inserted} stub docstrings.")
-        # Re-scan after insertion to update docstring content
-        if inserted > 0:
-            # Rebuild functions list for README generation
-            functions = []
-            for file_path in files:
-                functions.extend(scan_python_file(file_path))
     # Update README if requested
     if not args.no_readme:
-        update_readme(str(project_dir), functions)
+        update_readme(str(project_dir), table)
         print("Updated README.md with API reference section.")
 
 
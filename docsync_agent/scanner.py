@@ -10,167 +10,803 @@ handle docstrings.
 from __future__ import annotations
 
 import ast
+import io
+import mmap
 import os
+import queue
+import re
+import sys
 import textwrap
-from typing import Dict, List, Tuple
+import tokenize
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from . import _cache, _docstring_scan
+
+try:
+    # Optional: when pathspec is installed, the walkers also honour the
+    # project's .gitignore
+    import pathspec
+except ImportError:
+    pathspec = None
+
+try:
+    # Optional native accelerator: a Rust/PyO3 build of the walk+parse
+    # pipeline (walkdir + rustpython-parser) distributed as a separate
+    # wheel. The pure-Python path below is always available.
+    from . import _scanner_rs  # type: ignore[attr-defined]
+except ImportError:
+    _scanner_rs = None
 
 
 class FunctionInfo:
-    """Simple data structure to hold information about a function or method."""
+    """Simple data structure to hold information about a function or method.
+
+    Instances are slotted: a project can easily hold tens of thousands
+    of functions, and dropping the per-instance ``__dict__`` roughly
+    halves the memory footprint of a scan.
+    """
+
+    __slots__ = ("name", "args", "docstring", "lineno", "col_offset", "file_path", "body_lineno")
 
-    def __init__(self, name: str, args: List[str], docstring: str | None, lineno: int, col_offset: int, file_path: str) -> None:
+    def __init__(self, name: str, args: Sequence[str], docstring: str | None, lineno: int, col_offset: int, file_path: str, body_lineno: int | None = None) -> None:
         self.name = name
-        self.args = args
+        self.args = tuple(args)
         self.docstring = docstring
         self.lineno = lineno
         self.col_offset = col_offset
         self.file_path = file_path
+        # Line of the first body statement; None when unknown. A stub
+        # docstring belongs immediately before this line, which for
+        # multi-line signatures is not lineno + 1.
+        self.body_lineno = body_lineno
 
     def signature(self) -> str:
         return f"{self.name}({', '.join(self.args)})"
 
 
-def _gather_functions(node: ast.AST, file_path: str) -> List[FunctionInfo]:
-    """Recursively walk an AST node and collect information on functions.
+class FunctionTable:
+    """Column-oriented (struct-of-arrays) store of scanned functions.
+
+    Aggregation passes such as README generation touch only a couple of
+    fields per function; storing each field in its own parallel list
+    lets those passes walk one contiguous array at a time instead of
+    dereferencing a separate object per function.
+    """
+
+    __slots__ = ("names", "args", "docstrings", "linenos", "col_offsets", "file_paths", "body_linenos")
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.args: List[Tuple[str, ...]] = []
+        self.docstrings: List[str | None] = []
+        self.linenos: List[int] = []
+        self.col_offsets: List[int] = []
+        self.file_paths: List[str] = []
+        self.body_linenos: List[int | None] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def extend(self, functions: Sequence[FunctionInfo]) -> None:
+        """Append a batch of scanned functions, one value per column."""
+        for func in functions:
+            self.names.append(func.name)
+            self.args.append(func.args)
+            self.docstrings.append(func.docstring)
+            self.linenos.append(func.lineno)
+            self.col_offsets.append(func.col_offset)
+            self.file_paths.append(func.file_path)
+            self.body_linenos.append(func.body_lineno)
+
+    def signature(self, index: int) -> str:
+        """Return the rendered signature for the row at ``index``."""
+        return f"{self.names[index]}({', '.join(self.args[index])})"
+
+
+def _gather_functions(tree: ast.AST, file_path: str) -> List[FunctionInfo]:
+    """Collect information on every function defined beneath a node.
+
+    ``ast.walk`` visits the whole tree in one flat C-level iteration, so
+    functions nested inside classes, other functions, or conditional
+    blocks are all found without Python-level recursion.
 
     Args:
-        node: The AST node to examine.
+        tree: The AST node to examine.
         file_path: The file path the node belongs to.
 
     Returns:
-        A list of :class:`FunctionInfo` objects for each top-level function and
+        A list of :class:`FunctionInfo` objects for each function and
         method encountered.
     """
+    # Arg names (self, cls, x, ...) and the shared file path recur across
+    # thousands of functions; interning dedupes the string objects and
+    # makes downstream dict lookups pointer comparisons.
+    file_path = sys.intern(file_path)
     functions: List[FunctionInfo] = []
-    for child in ast.iter_child_nodes(node):
-        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            # Build list of argument names (omit self for methods)
-            arg_names = []
-            for arg in child.args.args:
-                if arg.arg == "self":
-                    continue
-                arg_names.append(arg.arg)
-            docstring = ast.get_docstring(child, clean=False)
-            info = FunctionInfo(
-                name=child.name,
-                args=arg_names,
-                docstring=docstring,
-                lineno=child.lineno,
-                col_offset=child.col_offset,
-                file_path=file_path,
+    # Hoist everything the hot loop touches into locals; on projects with
+    # hundreds of thousands of nodes the repeated global and attribute
+    # lookups are measurable.
+    append = functions.append
+    intern = sys.intern
+    make_info = FunctionInfo
+    function_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+    expr_type = ast.Expr
+    constant_type = ast.Constant
+    for node in ast.walk(tree):
+        if isinstance(node, function_types):
+            # Inline the ast.get_docstring check: a leading Expr holding a
+            # string Constant. The helper also handles cleaning and older
+            # node types we never see from a fresh parse.
+            docstring = None
+            body_lineno = None
+            body = node.body
+            if body:
+                first = body[0]
+                # A decorated statement starts at its first decorator;
+                # stubs spliced at first.lineno would split the two
+                decorators = getattr(first, "decorator_list", None)
+                body_lineno = decorators[0].lineno if decorators else first.lineno
+                if isinstance(first, expr_type):
+                    value = first.value
+                    if isinstance(value, constant_type) and isinstance(value.value, str):
+                        docstring = value.value
+            append(
+                make_info(
+                    node.name,
+                    # Positional argument names, omitting self for methods
+                    [intern(arg.arg) for arg in node.args.args if arg.arg != "self"],
+                    docstring,
+                    node.lineno,
+                    node.col_offset,
+                    file_path,
+                    body_lineno,
+                )
             )
-            functions.append(info)
-        # Recurse into classes and functions
-        if isinstance(child, ast.ClassDef):
-            functions.extend(_gather_functions(child, file_path))
-        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            functions.extend(_gather_functions(child, file_path))
+    # ast.walk visits breadth-first; restore source order so README
+    # sections (and parity with the token scanner) don't depend on
+    # nesting depth.
+    functions.sort(key=lambda func: func.lineno)
     return functions
 
 
-def scan_python_file(file_path: str) -> List[FunctionInfo]:
+def _scan_via_tokens(source: bytes, file_path: str) -> List[FunctionInfo] | None:
+    """Collect :class:`FunctionInfo` objects with a single tokenizer pass.
+
+    Everything we need — the function name, the positional argument
+    names, and whether the body opens with a string literal — is visible
+    in the token stream, and the tokenizer accepts many files the full
+    parser rejects (e.g. a syntax error in one function body). Returns
+    ``None`` when the source cannot be tokenized at all.
+    """
+    file_path = sys.intern(file_path)
+    functions: List[FunctionInfo] = []
+    try:
+        token_stream = tokenize.tokenize(io.BytesIO(source).readline)
+        pushed: List[tokenize.TokenInfo] = []
+
+        def next_token() -> tokenize.TokenInfo:
+            return pushed.pop() if pushed else next(token_stream)
+
+        async_start: Tuple[int, int] | None = None
+        while True:
+            tok = next_token()
+            if tok.type == tokenize.ENDMARKER:
+                break
+            if tok.type != tokenize.NAME:
+                async_start = None
+                continue
+            if tok.string == "async":
+                # Remember where `async def` started; ast positions an
+                # AsyncFunctionDef at the `async` keyword.
+                async_start = tok.start
+                continue
+            if tok.string != "def":
+                async_start = None
+                continue
+            lineno, col_offset = async_start or tok.start
+            async_start = None
+            name_tok = next_token()
+            if name_tok.type != tokenize.NAME:
+                continue
+            # Skip a PEP 695 type-parameter list (`def f[T](x)`) if present
+            tok = next_token()
+            if tok.exact_type == tokenize.LSQB:
+                depth = 1
+                while depth:
+                    tok = next_token()
+                    if tok.exact_type == tokenize.LSQB:
+                        depth += 1
+                    elif tok.exact_type == tokenize.RSQB:
+                        depth -= 1
+                tok = next_token()
+            if tok.exact_type != tokenize.LPAR:
+                continue
+            # Walk the argument list. Only depth-1 names in name position
+            # count; annotations, defaults and anything after a bare `*`
+            # or `**` are skipped, matching ast's `args.args`.
+            arg_names: List[str] = []
+            depth = 1
+            expect_name = True
+            star_seen = False
+            lambda_depth: int | None = None
+            while depth:
+                tok = next_token()
+                exact = tok.exact_type
+                if exact in (tokenize.LPAR, tokenize.LSQB, tokenize.LBRACE):
+                    depth += 1
+                elif exact in (tokenize.RPAR, tokenize.RSQB, tokenize.RBRACE):
+                    depth -= 1
+                elif depth == 1 and lambda_depth is None:
+                    if exact == tokenize.COMMA:
+                        expect_name = not star_seen
+                    elif exact in (tokenize.COLON, tokenize.EQUAL):
+                        expect_name = False
+                    elif exact in (tokenize.STAR, tokenize.DOUBLESTAR):
+                        star_seen = True
+                        expect_name = False
+                    elif exact == tokenize.SLASH:
+                        # Names before `/` are positional-only; ast keeps
+                        # them out of `args.args`.
+                        arg_names.clear()
+                        expect_name = False
+                    elif tok.type == tokenize.NAME:
+                        if tok.string == "lambda":
+                            # Suppress parsing until the lambda's `:` so its
+                            # parameters are not mistaken for ours.
+                            lambda_depth = depth
+                            expect_name = False
+                        elif expect_name:
+                            if tok.string != "self":
+                                arg_names.append(sys.intern(tok.string))
+                            expect_name = False
+                elif lambda_depth is not None and depth == lambda_depth and exact == tokenize.COLON:
+                    lambda_depth = None
+            # Skip past the return annotation to the `:` opening the body
+            depth = 0
+            while True:
+                tok = next_token()
+                exact = tok.exact_type
+                if exact in (tokenize.LPAR, tokenize.LSQB, tokenize.LBRACE):
+                    depth += 1
+                elif exact in (tokenize.RPAR, tokenize.RSQB, tokenize.RBRACE):
+                    depth -= 1
+                elif exact == tokenize.COLON and depth == 0:
+                    break
+            # Find the first body token: for a block, that is whatever
+            # follows NEWLINE/INDENT; for an inline body it follows `:`
+            while True:
+                tok = next_token()
+                if tok.type not in (
+                    tokenize.NEWLINE,
+                    tokenize.NL,
+                    tokenize.INDENT,
+                    tokenize.COMMENT,
+                ):
+                    break
+            body_lineno = tok.start[0]
+            docstring = None
+            if tok.type == tokenize.STRING:
+                # Concatenated literals ("a" "b") form one docstring; pick
+                # up the adjacent STRING tokens before evaluating.
+                parts = [tok.string]
+                while True:
+                    tok = next_token()
+                    if tok.type == tokenize.STRING:
+                        parts.append(tok.string)
+                    elif tok.type in (tokenize.NL, tokenize.COMMENT):
+                        continue
+                    else:
+                        break
+                try:
+                    docstring = ast.literal_eval(" ".join(parts))
+                except (ValueError, SyntaxError):
+                    docstring = None
+                if not isinstance(docstring, str):
+                    docstring = None
+            # The token after the (possible) docstring may itself open the
+            # next statement — a nested `def`, for instance — so hand it
+            # back to the main loop.
+            pushed.append(tok)
+            functions.append(
+                FunctionInfo(
+                    name=name_tok.string,
+                    args=arg_names,
+                    docstring=docstring,
+                    lineno=lineno,
+                    col_offset=col_offset,
+                    file_path=file_path,
+                    body_lineno=body_lineno,
+                )
+            )
+    except (tokenize.TokenError, IndentationError, SyntaxError, StopIteration):
+        return None
+    return functions
+
+
+# Directories that never hold first-party source. Descending into these
+# (a .venv can hide millions of third-party .py files) wastes both the
+# traversal and every parse downstream.
+_PRUNE_DIRS = frozenset(
+    {
+        ".git",
+        ".venv",
+        "venv",
+        "__pycache__",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        "node_modules",
+        "build",
+        "dist",
+        ".eggs",
+        "site-packages",
+    }
+)
+
+# Matches the opening of any function definition. Plenty of files
+# (__init__.py, constant tables, generated modules) define no functions
+# at all; a C-level regex search over the raw bytes is far cheaper than
+# discovering the same thing by building their AST.
+_DEF_RE = re.compile(rb"(?m)^[ \t]*(?:async[ \t]+)?def[ \t]+")
+
+# Sources at or above this size are memory-mapped rather than read into a
+# fresh bytes object; below it, mmap setup overhead outweighs the copy.
+_MMAP_MIN_SIZE = 64 * 1024
+
+# In-process memo of scan results keyed by path. The value pairs a
+# (st_mtime_ns, st_size) stamp with the functions list, so a second scan in
+# the same run (e.g. rebuilding the README after docstring insertion) only
+# re-parses files that were actually rewritten.
+_SCAN_MEMO: Dict[str, Tuple[Tuple[int, int], List[FunctionInfo]]] = {}
+
+
+def scan_python_file(
+    file_path: str, use_cache: bool = True, cache_root: str | None = None
+) -> List[FunctionInfo]:
     """Parse a Python file and return information on all functions and methods.
 
+    Results are memoized in-process per (mtime, size) and cached on disk
+    keyed by the source content (see :mod:`docsync_agent._cache`), so
+    files that have not changed since a previous scan skip parsing
+    entirely.
+
     Args:
         file_path: The path to the Python file to scan.
+        use_cache: Whether to consult and populate the on-disk cache.
+        cache_root: Directory holding the ``.docsync_cache/`` directory,
+            normally the root of the project being scanned. Defaults to
+            the current working directory.
 
     Returns:
         A list of :class:`FunctionInfo` objects describing the file's
         functions and methods.
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        source = f.read()
+    stat = os.stat(file_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    memoized = _SCAN_MEMO.get(file_path)
+    if memoized is not None and memoized[0] == version:
+        return memoized[1]
+    with open(file_path, "rb") as f:
+        if stat.st_size >= _MMAP_MIN_SIZE:
+            # Large files: hand the parser (and the hash) a zero-copy
+            # view; the kernel pages the bytes in on demand.
+            source: bytes | mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # Small files: mmap setup overhead dominates, plain read wins
+            source = f.read()
     try:
-        tree = ast.parse(source, filename=file_path)
-    except SyntaxError:
-        # Skip files with syntax errors
-        return []
-    return _gather_functions(tree, file_path)
+        if _DEF_RE.search(source) is None:
+            # Nothing resembling a def in the file: skip parsing outright
+            _SCAN_MEMO[file_path] = (version, [])
+            return []
+        if use_cache:
+            if cache_root is None:
+                cache_root = os.getcwd()
+            key = _cache.cache_key(source)
+            cached = _cache.load(cache_root, key)
+            if cached is not None:
+                # The key covers only the content; identical files at different
+                # paths share an entry, so restore the path we were asked about.
+                for func in cached:
+                    func.file_path = file_path
+                _SCAN_MEMO[file_path] = (version, cached)
+                return cached
+        try:
+            # ast.parse accepts bytes directly (honouring any PEP 263 coding
+            # cookie), so skip the intermediate str and its decode pass.
+            tree = ast.parse(source, filename=file_path)
+        except SyntaxError:
+            # The full parser rejected the file; the tokenizer is more
+            # forgiving, so try to salvage the scan before giving up.
+            functions = _scan_via_tokens(bytes(source), file_path)
+            if functions is None:
+                return []
+        else:
+            functions = _gather_functions(tree, file_path)
+    finally:
+        if isinstance(source, mmap.mmap):
+            source.close()
+    if use_cache:
+        _cache.store(cache_root, key, functions)
+    _SCAN_MEMO[file_path] = (version, functions)
+    return functions
+
+
+def _load_gitignore(root_dir: str):
+    """Compile the project's .gitignore when pathspec is installed."""
+    if pathspec is None:
+        return None
+    try:
+        with open(os.path.join(root_dir, ".gitignore"), "r", encoding="utf-8") as f:
+            return pathspec.PathSpec.from_lines("gitwildmatch", f)
+    except OSError:
+        return None
+
+
+def iter_python_files(root_dir: str, exclude: Sequence[str] = ()) -> Iterator[str]:
+    """Lazily yield Python files under the given directory.
 
+    Uses :func:`os.scandir` rather than :func:`os.walk` so that file-type
+    checks come from the directory entries themselves, avoiding a
+    ``stat()`` call per entry on most platforms. Well-known non-source
+    directories (see ``_PRUNE_DIRS``), anything named in ``exclude`` and
+    — when :mod:`pathspec` is installed — paths matched by the project's
+    ``.gitignore`` are pruned without being descended into.
+
+    Args:
+        root_dir: The directory to search.
+        exclude: Extra directory names to skip.
 
-def find_python_files(root_dir: str) -> List[str]:
+    Yields:
+        File paths to Python files, one at a time.
+    """
+    skip = _PRUNE_DIRS.union(exclude) if exclude else _PRUNE_DIRS
+    ignore_spec = _load_gitignore(root_dir)
+    pending = [root_dir]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            # Unreadable or concurrently-removed directory: skip it and
+            # keep walking, like os.walk with its default onerror=None
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in skip:
+                        continue
+                    if ignore_spec is not None and ignore_spec.match_file(
+                        os.path.relpath(entry.path, root_dir) + "/"
+                    ):
+                        continue
+                    pending.append(entry.path)
+                elif (
+                    entry.name.endswith(".py")
+                    and not entry.name.startswith(".")
+                    and entry.is_file(follow_symlinks=False)
+                ):
+                    if ignore_spec is not None and ignore_spec.match_file(
+                        os.path.relpath(entry.path, root_dir)
+                    ):
+                        continue
+                    yield entry.path
+
+
+def find_python_files(root_dir: str, exclude: Sequence[str] = ()) -> List[str]:
     """Recursively find Python files under the given directory.
 
     Args:
         root_dir: The directory to search.
+        exclude: Extra directory names to skip.
 
     Returns:
         A list of absolute file paths to Python files.
     """
+    return list(iter_python_files(root_dir, exclude))
+
+
+def find_python_files_parallel(
+    root_dir: str, workers: int = 16, exclude: Sequence[str] = ()
+) -> List[str]:
+    """Find Python files using several threads to read directories.
+
+    Directory listings are pure I/O, so on high-latency filesystems
+    (NFS, SMB) keeping many ``os.scandir`` calls in flight at once hides
+    the per-directory round trip. Worker threads pop directories off a
+    shared queue, push any subdirectories back, and collect matching
+    file paths.
+
+    Args:
+        root_dir: The directory to search.
+        workers: Number of traversal threads to run.
+        exclude: Extra directory names to skip.
+
+    Returns:
+        A list of file paths to Python files (in no particular order).
+    """
+    skip = _PRUNE_DIRS.union(exclude) if exclude else _PRUNE_DIRS
+    ignore_spec = _load_gitignore(root_dir)
+    pending: queue.Queue[str | None] = queue.Queue()
+    pending.put(root_dir)
     files: List[str] = []
-    for base, _dirs, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if filename.endswith(".py") and not filename.startswith("."):
-                files.append(os.path.join(base, filename))
+
+    def _worker() -> None:
+        while True:
+            directory = pending.get()
+            if directory is None:
+                pending.task_done()
+                return
+            try:
+                _scan_one_dir(directory)
+            except OSError:
+                # Unreadable or concurrently-removed directory: drop it
+                # and keep the worker alive; a dying worker would strand
+                # its queued work and eventually deadlock pending.join()
+                pass
+            finally:
+                pending.task_done()
+
+    def _scan_one_dir(directory: str) -> None:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in skip:
+                        continue
+                    if ignore_spec is not None and ignore_spec.match_file(
+                        os.path.relpath(entry.path, root_dir) + "/"
+                    ):
+                        continue
+                    pending.put(entry.path)
+                elif (
+                    entry.name.endswith(".py")
+                    and not entry.name.startswith(".")
+                    and entry.is_file(follow_symlinks=False)
+                ):
+                    if ignore_spec is not None and ignore_spec.match_file(
+                        os.path.relpath(entry.path, root_dir)
+                    ):
+                        continue
+                    # list.append is atomic under the GIL, so no extra
+                    # lock is needed for the results list.
+                    files.append(entry.path)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in range(workers):
+            pool.submit(_worker)
+        # Wait until every queued directory has been processed, then wake
+        # each worker with a sentinel so the pool can shut down.
+        pending.join()
+        for _ in range(workers):
+            pending.put(None)
     return files
 
 
-def insert_missing_docstrings(functions: List[FunctionInfo]) -> int:
+def scan_missing_docstrings(file_path: str) -> List[FunctionInfo]:
+    """Return only the undocumented functions of a file.
+
+    Insert-only runs need just the name and location of each function
+    lacking a docstring, which
+    :func:`docsync_agent._docstring_scan.missing_docstring_defs`
+    answers — via a raw byte pass when the compiled scanner is
+    installed, via the regular parsers otherwise — without building
+    full rows or touching the cache.
+
+    Args:
+        file_path: The path to the Python file to scan.
+
+    Returns:
+        A list of :class:`FunctionInfo` objects with ``docstring`` set
+        to ``None`` and empty ``args``.
+    """
+    with open(file_path, "rb") as f:
+        source = f.read()
+    file_path = sys.intern(file_path)
+    return [
+        FunctionInfo(name, (), None, lineno, col_offset, file_path, body_lineno)
+        for lineno, col_offset, name, body_lineno in _docstring_scan.missing_docstring_defs(source)
+    ]
+
+
+def scan_project(
+    root_dir: str, use_cache: bool = True, exclude: Sequence[str] = ()
+) -> List[FunctionInfo]:
+    """Find and scan every Python file under ``root_dir`` in one call.
+
+    When the optional :mod:`docsync_agent._scanner_rs` extension is
+    installed, the entire traversal-and-parse pipeline runs natively and
+    returns packed ``(name, args, docstring, lineno, col_offset,
+    file_path, body_lineno)`` rows; otherwise the pure-Python walker and
+    parser are used. The extension receives the extra ``exclude`` names alongside
+    the root, so pruning behaves the same on both paths. The native path
+    does not consult the on-disk cache — it parses quickly enough not to
+    need it.
+
+    Args:
+        root_dir: The directory to scan.
+        use_cache: Whether the pure-Python path may use the on-disk cache.
+        exclude: Extra directory names to skip during traversal.
+
+    Returns:
+        A list of :class:`FunctionInfo` objects for the whole project.
+    """
+    if _scanner_rs is not None:
+        return [
+            FunctionInfo(*row)
+            for row in _scanner_rs.scan_project(root_dir, list(exclude))
+        ]
+    functions: List[FunctionInfo] = []
+    for file_path in iter_python_files(root_dir, exclude):
+        functions.extend(
+            scan_python_file(file_path, use_cache=use_cache, cache_root=root_dir)
+        )
+    return functions
+
+
+def insert_missing_docstrings(table: FunctionTable) -> Tuple[int, set[str]]:
     """Insert stub docstrings into functions that currently have none.
 
     Args:
-        functions: A list of :class:`FunctionInfo` objects, possibly from
-            different files.
+        table: A :class:`FunctionTable` of scanned functions, possibly
+            spanning several files.
+
+    Rows that receive a stub have their ``docstrings`` entry updated in
+    place, so the table stays authoritative without a re-scan.
 
     Returns:
-        The number of docstrings inserted.
+        A tuple of the number of docstrings inserted and the set of
+        file paths that were rewritten.
     """
-    # Group functions by file for efficient writing
-    functions_by_file: Dict[str, List[FunctionInfo]] = {}
-    for func in functions:
-        if func.docstring is None:
-            functions_by_file.setdefault(func.file_path, []).append(func)
+    # Group the rows lacking a docstring by file for efficient writing
+    rows_by_file: Dict[str, List[int]] = {}
+    for index, docstring in enumerate(table.docstrings):
+        if docstring is None:
+            rows_by_file.setdefault(table.file_paths[index], []).append(index)
     count = 0
-    for file_path, funcs in functions_by_file.items():
+    mutated: set[str] = set()
+    for file_path, rows in rows_by_file.items():
         # Read file lines
         with open(file_path, "r", encoding="utf-8") as f:
             lines = f.readlines()
-        # Sort functions by line number descending
-        funcs_sorted = sorted(funcs, key=lambda f: f.lineno, reverse=True)
-        for func_info in funcs_sorted:
-            indent = " " * (func_info.col_offset + 4)
-            stub = f'{indent}"""TODO: Document `{func_info.name}`."""\n'
-            # Insert after the def line (line numbers are 1-based)
-            insert_index = func_info.lineno  # After def line
-            lines.insert(insert_index, stub)
-            count += 1
+        # Merge the stubs in one forward pass over the file. Calling
+        # list.insert per stub would shift the tail of the file each
+        # time, going quadratic on files with many missing docstrings.
+        # Each stub goes immediately before the first body statement —
+        # splicing right after the def line would land mid-signature for
+        # multi-line signatures.
+        def _insert_at(index: int) -> int:
+            body_lineno = table.body_linenos[index]
+            if body_lineno is not None:
+                return body_lineno - 1
+            return table.linenos[index]
+
+        rows_sorted = sorted(rows, key=_insert_at)
+        out: List[str] = []
+        position = 0
+        inserted_here = 0
+        for index in rows_sorted:
+            body_lineno = table.body_linenos[index]
+            if body_lineno is not None and body_lineno == table.linenos[index]:
+                # Inline body (def f(): pass) — there is no line where a
+                # docstring can be spliced without rewriting the statement
+                continue
+            if body_lineno is not None:
+                # Copy the indentation (spaces or tabs) of the statement
+                # the stub is displacing
+                insert_at = body_lineno - 1
+                body_line = lines[insert_at]
+                indent = body_line[: len(body_line) - len(body_line.lstrip())]
+            else:
+                insert_at = table.linenos[index]
+                indent = " " * (table.col_offsets[index] + 4)
+            stub_text = f"TODO: Document `{table.names[index]}`."
+            out.extend(lines[position:insert_at])
+            out.append(f'{indent}"""{stub_text}"""\n')
+            table.docstrings[index] = stub_text
+            position = insert_at
+            inserted_here += 1
+        if inserted_here == 0:
+            continue
+        out.extend(lines[position:])
+        count += inserted_here
+        mutated.add(file_path)
         # Write file back
         with open(file_path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
-    return count
+            f.writelines(out)
+        # The file on disk no longer matches the memoized scan
+        _SCAN_MEMO.pop(file_path, None)
+    return count, mutated
+
+
+def insert_missing_docstrings_ast(file_path: str) -> Tuple[int, List[FunctionInfo]]:
+    """Insert stub docstrings by rewriting a file from its AST.
+
+    Unlike :func:`insert_missing_docstrings`, which splices stub lines
+    into the original text using ``col_offset`` arithmetic, this
+    transform adds an ``ast.Expr`` string constant as the first body
+    statement of each undocumented function and re-emits the file with
+    :func:`ast.unparse`. That makes it robust to tab indentation and
+    multi-line ``def`` signatures, where line splicing would drop the
+    stub mid-signature. The trade-off is that ``ast.unparse``
+    normalizes formatting and discards comments, so this is an opt-in
+    path for generated or machine-owned files rather than the default.
+
+    Args:
+        file_path: The path to the Python file to rewrite.
+
+    Returns:
+        A tuple of the number of docstrings inserted and the
+        :class:`FunctionInfo` list for the rewritten file, so callers
+        can skip a re-scan.
+    """
+    with open(file_path, "rb") as f:
+        source = f.read()
+    try:
+        tree = ast.parse(source, filename=file_path)
+    except SyntaxError:
+        return 0, []
+    count = 0
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and ast.get_docstring(node) is None
+        ):
+            stub = ast.Expr(value=ast.Constant(value=f"TODO: Document `{node.name}`."))
+            node.body.insert(0, stub)
+            count += 1
+    if count:
+        ast.fix_missing_locations(tree)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(ast.unparse(tree) + "\n")
+        # The file on disk no longer matches the memoized scan
+        _SCAN_MEMO.pop(file_path, None)
+    return count, _gather_functions(tree, file_path)
 
 
-def generate_api_reference(functions: List[FunctionInfo]) -> List[str]:
-    """Generate a Markdown API reference section from function information.
+def generate_api_reference(table: FunctionTable) -> str:
+    """Generate a Markdown API reference section from scanned functions.
 
-    The output is a list of strings, one per line, containing Markdown
-    formatted text documenting each function by file.
+    The output is written straight into a string buffer rather than a
+    list of per-line strings, avoiding thousands of small allocations
+    and a final join copy on large projects.
 
     Args:
-        functions: A list of :class:`FunctionInfo` objects.
+        table: A :class:`FunctionTable` of scanned functions.
 
     Returns:
-        A list of strings forming the API reference section.
+        The API reference section as a single Markdown string, without
+        a trailing newline.
     """
-    lines: List[str] = []
-    # Group functions by file relative name
-    grouped: Dict[str, List[FunctionInfo]] = {}
-    for func in functions:
-        rel = os.path.relpath(func.file_path)
-        grouped.setdefault(rel, []).append(func)
+    buf = io.StringIO()
+    write = buf.write
+    # Group row indices by file relative name; only the file_paths column
+    # is touched during this pass. Every function in a file shares its
+    # path, and relpath stats nothing but still normalizes through
+    # getcwd/abspath each call, so resolve each unique path once.
+    grouped: Dict[str, List[int]] = {}
+    rel_cache: Dict[str, str] = {}
+    cwd = os.getcwd()
+    for index, file_path in enumerate(table.file_paths):
+        rel = rel_cache.get(file_path)
+        if rel is None:
+            rel = rel_cache[file_path] = sys.intern(os.path.relpath(file_path, cwd))
+        grouped.setdefault(rel, []).append(index)
     for file_name in sorted(grouped.keys()):
-        lines.append(f"### `{file_name}`")
-        for func in grouped[file_name]:
-            signature = func.signature()
-            doc = (func.docstring or "TODO: Write documentation").splitlines()[0].strip()
+        write(f"### `{file_name}`\n")
+        for index in grouped[file_name]:
+            signature = table.signature(index)
+            doc = (table.docstrings[index] or "TODO: Write documentation").splitlines()[0].strip()
             # Escape backticks in signature
             signature_escaped = signature.replace("`", "\`")
-            lines.append(f"- **{signature_escaped}**: {doc}")
-        lines.append("")
-    return lines
+            write(f"- **{signature_escaped}**: {doc}\n")
+        write("\n")
+    return buf.getvalue()[:-1] if grouped else ""
 
 
-def update_readme(project_root: str, functions: List[FunctionInfo]) -> None:
+def update_readme(project_root: str, table: FunctionTable) -> None:
     """Update a project's README.md API reference section.
 
     The function looks for markers ``<!-- DOCS START -->`` and ``<!-- DOCS END -->``
@@ -181,8 +817,8 @@ def update_readme(project_root: str, functions: List[FunctionInfo]) -> None:
 
     Args:
         project_root: The root directory of the project.
-        functions: A list of :class:`FunctionInfo` objects used to build
-            the API reference.
+        table: A :class:`FunctionTable` of scanned functions used to
+            build the API reference.
     """
     readme_path = os.path.join(project_root, "README.md")
     if os.path.exists(readme_path):
@@ -192,13 +828,17 @@ def update_readme(project_root: str, functions: List[FunctionInfo]) -> None:
         contents = "# Project Documentation\n\n"
     start_marker = "<!-- DOCS START -->"
     end_marker = "<!-- DOCS END -->"
-    api_lines = generate_api_reference(functions)
-    api_content = "\n".join([start_marker] + api_lines + [end_marker])
-    if start_marker in contents and end_marker in contents:
+    api_body = generate_api_reference(table)
+    # filter(None, ...) drops the body when the table is empty, keeping
+    # the markers adjacent
+    api_content = "\n".join(filter(None, (start_marker, api_body, end_marker)))
+    # Locate the markers with two forward find calls; each split-based
+    # alternative would rescan the whole README and allocate list parts.
+    start = contents.find(start_marker)
+    end = contents.find(end_marker, start + len(start_marker)) if start != -1 else -1
+    if end != -1:
         # Replace existing section
-        before = contents.split(start_marker)[0]
-        after = contents.split(end_marker)[1]
-        new_contents = before + api_content + after
+        new_contents = contents[:start] + api_content + contents[end + len(end_marker):]
     else:
         # Append new section
         if not contents.endswith("\n"):